@@ -7,6 +7,8 @@ for interacting with the Langbase API.
 
 from typing import Optional
 
+import requests
+
 from .primitives.agent import Agent
 from .primitives.chunker import Chunker
 from .primitives.embed import Embed
@@ -26,18 +28,29 @@ class Langbase:
     including pipes, memories, tools, threads, and utilities.
     """
 
-    def __init__(self, api_key: str = "", base_url: str = "https://api.langbase.com"):
+    def __init__(
+        self,
+        api_key: str = "",
+        base_url: str = "https://api.langbase.com",
+        session: Optional[requests.Session] = None,
+    ):
         """
         Initialize the Langbase client.
 
         Args:
             api_key: The API key for authentication.
             base_url: The base URL for the API.
+            session: Optional requests.Session to reuse for every API call.
+                When omitted, the client creates one Session and uses it for
+                every call, so a client shared across threads shares that
+                Session too. Call close() to release it.
         """
         self.base_url = base_url
         self.api_key = api_key
 
-        self.request = Request({"api_key": self.api_key, "base_url": self.base_url})
+        self.request = Request(
+            {"api_key": self.api_key, "base_url": self.base_url, "session": session}
+        )
 
         # Initialize primitive classes
         self.agent = Agent(self)
@@ -49,6 +62,16 @@ class Langbase:
         self.threads = Threads(self)
         self.tools = Tools(self)
 
+    def close(self) -> None:
+        """Close the HTTP session, unless it was passed in by the caller."""
+        self.request.close()
+
+    def __enter__(self) -> "Langbase":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
     def embed(self, chunks, embedding_model=None):
         """Generate embeddings for text chunks."""
         return self.embed_client.embed(chunks, embedding_model)
@@ -119,7 +119,7 @@ class Documents:
                 raise ValueError(msg)
 
             # Upload to signed URL
-            upload_response = requests.put(
+            upload_response = self.request.session.put(
                 upload_url,
                 headers={
                     "Authorization": f"Bearer {self.parent.parent.api_key}",
@@ -159,7 +159,13 @@ class Pipes:
         # Create a new request instance if API key is provided
         request = self.request
         if api_key:
-            request = Request({"api_key": api_key, "base_url": self.parent.base_url})
+            request = Request(
+                {
+                    "api_key": api_key,
+                    "base_url": self.parent.base_url,
+                    "session": self.request.session,
+                }
+            )
 
         headers = {}
         if llm_key:
@@ -30,10 +30,36 @@ class Request:
             config: Configuration dictionary containing:
                 - api_key: API key for authentication
                 - base_url: Base URL for the API
+                - session: Optional requests.Session to send requests with
         """
-        self.config = config
-        self.api_key = config.get("api_key", "")
-        self.base_url = config.get("base_url", "")
+        # Copy so the keys set below never leak into the caller's dict
+        self.config = dict(config)
+        self.api_key = self.config.get("api_key", "")
+        self.base_url = self.config.get("base_url", "")
+        # Reuse one session so connections are kept alive across requests
+        self._owns_session = self.config.get("session") is None
+        if self._owns_session:
+            self.config["session"] = requests.Session()
+        self.session = self.config["session"]
+
+    def close(self) -> None:
+        """Close the session if this handler created it."""
+        if self._owns_session:
+            self.session.close()
+
+    @property
+    def api_key(self) -> str:
+        """API key sent in the Authorization header."""
+        return self._api_key
+
+    @api_key.setter
+    def api_key(self, api_key: str) -> None:
+        self._api_key = self.config["api_key"] = api_key
+        # Format the default headers once per key rather than on every request
+        self._base_headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}",
+        }
 
     def build_url(self, endpoint: str) -> str:
         """
@@ -61,10 +87,7 @@ class Request:
         Returns:
             Dictionary of headers for the request
         """
-        default_headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.api_key}",
-        }
+        default_headers = dict(self._base_headers)
 
         if headers:
             default_headers.update(headers)
@@ -105,7 +128,7 @@ class Request:
                 filtered_headers = {
                     k: v for k, v in headers.items() if k != "Content-Type"
                 }
-                response = requests.request(
+                response = self.session.request(
                     method=method,
                     url=url,
                     headers=filtered_headers,
@@ -113,7 +136,7 @@ class Request:
                     stream=stream,
                 )
             else:
-                response = requests.request(
+                response = self.session.request(
                     method=method,
                     url=url,
                     headers=headers,
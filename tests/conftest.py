@@ -2,37 +2,80 @@
 Shared test config and fixtures for Langbase SDK tests.
 """
 
+import copy
+import json
 import time
+from collections.abc import Mapping
+from contextlib import contextmanager
 
 import pytest
+import requests
 
 from langbase import Langbase
+from tests.mock_transport import MockTransport
 
 
-@pytest.fixture
+class CopyOnReadMapping(Mapping):
+    """Read-only mapping that hands out a deep copy of each value it holds."""
+
+    def __init__(self, data):
+        self._data = data
+
+    def __getitem__(self, key):
+        return copy.deepcopy(self._data[key])
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+
+@pytest.fixture(scope="session")
 def base_url():
     """Base URL for the Langbase API."""
     return "https://api.langbase.com"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def api_key():
     """Test API key."""
     return "test-api-key"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def langbase_client(api_key, base_url):
     """Langbase client instance for testing."""
     return Langbase(api_key=api_key, base_url=base_url)
 
 
 @pytest.fixture
+def override_api_key():
+    """Context manager that swaps the API key of a shared client for one block."""
+
+    @contextmanager
+    def _override(client, key):
+        old_key = client.api_key
+        client.api_key = client.request.api_key = key
+        try:
+            yield client
+        finally:
+            client.api_key = client.request.api_key = old_key
+
+    return _override
+
+
+@pytest.fixture(scope="session")
 def mock_responses():
-    """Common mock response patterns matching the actual types from types.py."""
+    """
+    Common mock response patterns matching the actual types from types.py.
+
+    The payloads are built once per session, but every lookup returns a fresh
+    deep copy. This isolates tests from each other; it is not a cache.
+    """
     timestamp = int(time.time())
 
-    return {
+    mocks = {
         # Pipes responses (RunResponse type)
         "pipe_list": [
             {
@@ -305,19 +348,60 @@ def mock_responses():
         },
     }
 
+    return CopyOnReadMapping(mocks)
+
+
+@pytest.fixture(scope="session")
+def mock_response_bodies(mock_responses):
+    """Mock responses pre-encoded as JSON bytes, serialized once per session."""
+    return {key: json.dumps(value).encode() for key, value in mock_responses.items()}
+
+
+@pytest.fixture(scope="module")
+def mock_routes(request, mock_response_bodies):
+    """
+    Routes registered once per module from the module's MOCK_ROUTES table.
+
+    Each entry is (method, url, mock response key, status); a key of None
+    serves an empty body.
+    """
+    routes = MockTransport()
+    for method, url, key, status in getattr(request.module, "MOCK_ROUTES", ()):
+        body = mock_response_bodies[key] if key else b""
+        routes.add(method, url, body=body, status=status)
+    return routes
+
 
 @pytest.fixture
+def mock_http(monkeypatch, mock_routes):
+    """In-process transport that answers every SDK request for one test."""
+    transport = MockTransport(shared=mock_routes)
+    monkeypatch.setattr(
+        requests.adapters.HTTPAdapter,
+        "send",
+        lambda adapter, request, **kwargs: transport.send(request, **kwargs),
+    )
+    return transport
+
+
+@pytest.fixture(scope="session")
 def stream_chunks():
     """Sample streaming response chunks for SSE (Server-Sent Events) format."""
-    return [
+    return (
         b'data: {"choices":[{"delta":{"content":"Hello"},"index":0}]}\n\n',
         b'data: {"choices":[{"delta":{"content":" world"},"index":0}]}\n\n',
         b'data: {"choices":[{"delta":{"content":"!"},"index":0}]}\n\n',
         b"data: [DONE]\n\n",
-    ]
+    )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def stream_body(stream_chunks):
+    """The sample stream chunks joined into a single response body."""
+    return b"".join(stream_chunks)
+
+
+@pytest.fixture(scope="session")
 def upload_file_content():
     """Sample file content for upload tests."""
     return b"This is test document content for upload testing."
@@ -1,12 +1,20 @@
-AUTHORIZATION_HEADER = {
-    "Authorization": "Bearer test-api-key",
-}
+from types import MappingProxyType
 
-JSON_CONTENT_TYPE_HEADER = {
-    "Content-Type": "application/json",
-}
+AUTHORIZATION_HEADER = MappingProxyType(
+    {
+        "Authorization": "Bearer test-api-key",
+    }
+)
 
-AUTH_AND_JSON_CONTENT_HEADER = {
-    **AUTHORIZATION_HEADER,
-    **JSON_CONTENT_TYPE_HEADER,
-}
+JSON_CONTENT_TYPE_HEADER = MappingProxyType(
+    {
+        "Content-Type": "application/json",
+    }
+)
+
+AUTH_AND_JSON_CONTENT_HEADER = MappingProxyType(
+    {
+        **AUTHORIZATION_HEADER,
+        **JSON_CONTENT_TYPE_HEADER,
+    }
+)
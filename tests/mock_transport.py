@@ -0,0 +1,87 @@
+"""
+In-process HTTP transport for the Langbase SDK tests.
+"""
+
+from collections import ChainMap
+from http.client import responses as HTTP_REASONS
+from typing import Dict, List, MutableMapping, Optional, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class MockTransport:
+    """
+    Serves canned responses keyed by (method, url) and records every request.
+
+    Requests never reach urllib3 or a socket: the prepared request is recorded
+    as-is and answered from a dict lookup.
+    """
+
+    def __init__(self, shared: Optional["MockTransport"] = None):
+        """
+        Initialize a transport.
+
+        Args:
+            shared: Transport whose routes are served unless overridden here.
+                Routes added to this transport never leak back into it.
+        """
+        self.calls: List[requests.PreparedRequest] = []
+        self._routes: MutableMapping[
+            Tuple[str, str], Tuple[int, bytes, Dict[str, str]]
+        ] = (ChainMap({}, shared._routes) if shared else {})
+
+    def add(
+        self,
+        method: str,
+        url: str,
+        body: bytes = b"",
+        status: int = 200,
+        content_type: str = "application/json",
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """
+        Register the response returned for a method and URL.
+
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            url: Complete URL of the request
+            body: Raw response body
+            status: HTTP status code
+            content_type: Value of the Content-Type response header
+            headers: Additional response headers
+        """
+        response_headers = {"Content-Type": content_type, **(headers or {})}
+        self._routes[(method, url)] = (status, body, response_headers)
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        """
+        Record a prepared request and answer it from the registered routes.
+
+        Args:
+            request: The prepared request sent by the SDK
+
+        Returns:
+            Response built from the registered route
+
+        Raises:
+            requests.ConnectionError: If no route matches the request
+        """
+        self.calls.append(request)
+
+        route = self._routes.get((request.method, request.url))
+        if route is None:
+            msg = f"No mock registered for {request.method} {request.url}"
+            raise requests.ConnectionError(msg, request=request)
+
+        status, body, headers = route
+        response = requests.Response()
+        response.status_code = status
+        response.reason = HTTP_REASONS.get(status, "")
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response._content = body
+        response._content_consumed = True
+        return response
@@ -1,6 +1,7 @@
 """Test error handling functionality."""
 
 import pytest
+import requests
 
 from langbase.errors import (
     APIConnectionError,
@@ -179,8 +180,6 @@ class TestExceptionHandling:
 
     def test_connection_error_with_cause(self):
         """Test connection error with underlying cause."""
-        import requests
-
         # Simulate a connection error
         connection_error = requests.ConnectionError("Network unreachable")
         error = APIConnectionError("Connection failed", cause=connection_error)
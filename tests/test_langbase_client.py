@@ -2,7 +2,14 @@
 Tests for Langbase client initialization and configuration.
 """
 
+import copy
+import pickle
+from unittest import mock
+
+import requests
+
 from langbase import Langbase
+from langbase.request import Request
 
 
 class TestLangbaseClient:
@@ -24,6 +31,64 @@ class TestLangbaseClient:
         assert langbase_client.request.api_key == "test-api-key"
         assert langbase_client.request.base_url == "https://api.langbase.com"
 
+    def test_initialization_with_session(self):
+        """Test that a provided session is used for API requests."""
+        session = requests.Session()
+        client = Langbase(api_key="test-api-key", session=session)
+        assert client.request.session is session
+
+    def test_default_session_created(self, langbase_client):
+        """Test that a session is created when none is provided."""
+        assert isinstance(langbase_client.request.session, requests.Session)
+        assert langbase_client.request.config["session"] is (
+            langbase_client.request.session
+        )
+
+    def test_request_copies_config(self):
+        """Test that Request never writes into the config dict it is given."""
+        config = {"api_key": "test-api-key", "base_url": "https://api.langbase.com"}
+        first, second = Request(config), Request(config)
+        assert "session" not in config
+        assert first.session is not second.session
+
+    def test_close_only_closes_created_session(self):
+        """Test that close() leaves a caller's session open."""
+        session = requests.Session()
+        with mock.patch.object(session, "close") as close:
+            Langbase(api_key="test-api-key", session=session).close()
+        close.assert_not_called()
+
+        with mock.patch.object(requests.Session, "close") as close:
+            with Langbase(api_key="test-api-key"):
+                pass
+        close.assert_called_once_with()
+
+    def test_build_headers_follows_api_key(self):
+        """Test that default headers are rebuilt when the API key changes."""
+        client = Langbase(api_key="first-key")
+        client.request.api_key = "second-key"
+        headers = client.request.build_headers({"LB-LLM-KEY": "llm-key"})
+        assert client.request.config["api_key"] == "second-key"
+        assert headers == {
+            "Content-Type": "application/json",
+            "Authorization": "Bearer second-key",
+            "LB-LLM-KEY": "llm-key",
+        }
+
+    def test_client_can_be_copied_and_pickled(self):
+        """Test that a client survives deepcopy and a pickle round trip."""
+        client = Langbase(api_key="test-api-key")
+        for clone in (copy.deepcopy(client), pickle.loads(pickle.dumps(client))):
+            assert clone.api_key == "test-api-key"
+            assert clone.request.build_headers() == client.request.build_headers()
+
+    def test_request_methods_can_be_patched(self):
+        """Test that request methods can be patched on a client instance."""
+        client = Langbase(api_key="test-api-key")
+        with mock.patch.object(client.request, "get", return_value=[]) as get:
+            assert client.pipes.list() == []
+        get.assert_called_once_with("/v1/pipes")
+
     def test_nested_class_initialization(self, langbase_client):
         """Test that nested classes are properly initialized."""
         # Test pipes
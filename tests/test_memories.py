@@ -2,10 +2,13 @@
 Tests for the Memories API.
 """
 
-import json
+from types import MappingProxyType
+from typing import List
 
-import responses
+import pytest
+import requests
 
+from langbase import Langbase
 from langbase.constants import (
     BASE_URL,
     MEMORY_DETAIL_ENDPOINT,
@@ -29,31 +32,59 @@ from tests.constants import (
     AUTHORIZATION_HEADER,
     JSON_CONTENT_TYPE_HEADER,
 )
-from tests.validation_utils import validate_response_headers
+from tests.validation_utils import (
+    body_json,
+    validate_response_body,
+    validate_response_headers,
+)
+
+pytestmark = pytest.mark.xdist_group(name="memories")
+
+MEMORY_NAME = "test-memory"
+DOCUMENT_NAME = "test-doc.txt"
+SIGNED_UPLOAD_URL = "https://storage.langbase.com/upload?signature=xyz"
+MEMORIES_URL = f"{BASE_URL}{MEMORY_ENDPOINT}"
+RETRIEVE_URL = f"{BASE_URL}{MEMORY_RETRIEVE_ENDPOINT}"
+MEMORY_DETAIL_URL = f"{BASE_URL}{MEMORY_DETAIL_ENDPOINT.format(name=MEMORY_NAME)}"
+DOCUMENTS_URL = f"{BASE_URL}{MEMORY_DOCUMENTS_ENDPOINT.format(memory_name=MEMORY_NAME)}"
+UPLOAD_URL = f"{BASE_URL}{MEMORY_DOCUMENTS_UPLOAD_ENDPOINT}"
+DOCUMENT_DETAIL_URL = BASE_URL + MEMORY_DOCUMENT_DETAIL_ENDPOINT.format(
+    memory_name=MEMORY_NAME, document_name=DOCUMENT_NAME
+)
+DOCUMENT_RETRY_URL = BASE_URL + MEMORY_DOCUMENT_EMBEDDINGS_RETRY_ENDPOINT.format(
+    memory_name=MEMORY_NAME, document_name=DOCUMENT_NAME
+)
+TEXT_UPLOAD_HEADERS = MappingProxyType(
+    {**AUTHORIZATION_HEADER, "Content-Type": "text/plain"}
+)
+
+MOCK_ROUTES = [
+    ("GET", MEMORIES_URL, "memory_list", 200),
+    ("POST", MEMORIES_URL, "memory_create", 201),
+    ("DELETE", MEMORY_DETAIL_URL, "memory_delete", 200),
+    ("POST", RETRIEVE_URL, "memory_retrieve", 200),
+    ("GET", DOCUMENTS_URL, "memory_docs_list", 200),
+    ("DELETE", DOCUMENT_DETAIL_URL, "memory_docs_delete", 200),
+    ("POST", UPLOAD_URL, "memory_docs_upload_signed_url", 200),
+    ("PUT", SIGNED_UPLOAD_URL, None, 200),
+    ("GET", DOCUMENT_RETRY_URL, "memory_docs_embeddings_retry", 200),
+]
 
 
 class TestMemories:
     """Test the Memories API."""
 
-    @responses.activate
-    def test_memories_list(self, langbase_client, mock_responses):
+    def test_memories_list(self, langbase_client, mock_http, mock_responses):
         """Test memories.list method."""
-        responses.add(
-            responses.GET,
-            f"{BASE_URL}{MEMORY_ENDPOINT}",
-            json=mock_responses["memory_list"],
-            status=200,
-        )
-
         result = langbase_client.memories.list()
 
         assert result == mock_responses["memory_list"]
-        assert len(responses.calls) == 1
-        request = responses.calls[0].request
+        validate_response_body(result, List[MemoryListResponse])
+        assert len(mock_http.calls) == 1
+        request = mock_http.calls[0]
         validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
 
-    @responses.activate
-    def test_memories_create(self, langbase_client, mock_responses):
+    def test_memories_create(self, langbase_client, mock_http, mock_responses):
         """Test memories.create method."""
         request_body = {
             "name": "new-memory",
@@ -61,42 +92,24 @@ class TestMemories:
             "embedding_model": "openai:text-embedding-ada-002",
         }
 
-        responses.add(
-            responses.POST,
-            f"{BASE_URL}{MEMORY_ENDPOINT}",
-            json=mock_responses["memory_create"],
-            status=201,
-        )
-
         result = langbase_client.memories.create(**request_body)
 
         assert result == mock_responses["memory_create"]
-        assert len(responses.calls) == 1
-        request = responses.calls[0].request
+        assert len(mock_http.calls) == 1
+        request = mock_http.calls[0]
         validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
-        assert json.loads(request.body) == request_body
+        assert body_json(request) == request_body
 
-    @responses.activate
-    def test_memories_delete(self, langbase_client, mock_responses):
+    def test_memories_delete(self, langbase_client, mock_http, mock_responses):
         """Test memories.delete method."""
-        memory_name = "test-memory"
-
-        responses.add(
-            responses.DELETE,
-            f"{BASE_URL}{MEMORY_DETAIL_ENDPOINT.format(name=memory_name)}",
-            json=mock_responses["memory_delete"],
-            status=200,
-        )
-
-        result = langbase_client.memories.delete(memory_name)
+        result = langbase_client.memories.delete(MEMORY_NAME)
 
         assert result == mock_responses["memory_delete"]
-        assert len(responses.calls) == 1
-        request = responses.calls[0].request
+        assert len(mock_http.calls) == 1
+        request = mock_http.calls[0]
         validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
 
-    @responses.activate
-    def test_memories_retrieve(self, langbase_client, mock_responses):
+    def test_memories_retrieve(self, langbase_client, mock_http, mock_responses):
         """Test memories.retrieve method."""
         request_body = {
             "query": "test query",
@@ -104,13 +117,6 @@ class TestMemories:
             "topK": 5,
         }
 
-        responses.add(
-            responses.POST,
-            f"{BASE_URL}{MEMORY_RETRIEVE_ENDPOINT}",
-            json=mock_responses["memory_retrieve"],
-            status=200,
-        )
-
         result = langbase_client.memories.retrieve(
             query=request_body["query"],
             memory=request_body["memory"],
@@ -118,150 +124,90 @@ class TestMemories:
         )
 
         assert result == mock_responses["memory_retrieve"]
-        assert len(responses.calls) == 1
-        request = responses.calls[0].request
+        validate_response_body(result, List[MemoryRetrieveResponse])
+        assert len(mock_http.calls) == 1
+        request = mock_http.calls[0]
         validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
-        assert json.loads(request.body) == request_body
+        assert body_json(request) == request_body
 
 
 class TestMemoryDocuments:
     """Test the Memory Documents API."""
 
-    @responses.activate
-    def test_documents_list(self, langbase_client, mock_responses):
+    def test_documents_list(self, langbase_client, mock_http, mock_responses):
         """Test documents.list method."""
-        memory_name = "test-memory"
-
-        responses.add(
-            responses.GET,
-            f"{BASE_URL}{MEMORY_DOCUMENTS_ENDPOINT.format(memory_name=memory_name)}",
-            json=mock_responses["memory_docs_list"],
-            status=200,
-        )
-
-        result = langbase_client.memories.documents.list(memory_name)
+        result = langbase_client.memories.documents.list(MEMORY_NAME)
 
         assert result == mock_responses["memory_docs_list"]
-        assert len(responses.calls) == 1
-        request = responses.calls[0].request
+        validate_response_body(result, List[MemoryListDocResponse])
+        assert len(mock_http.calls) == 1
+        request = mock_http.calls[0]
         validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
 
-    @responses.activate
-    def test_documents_delete(self, langbase_client, mock_responses):
+    def test_documents_delete(self, langbase_client, mock_http, mock_responses):
         """Test documents.delete method."""
-        memory_name = "test-memory"
-        document_name = "test-doc.txt"
-
-        responses.add(
-            responses.DELETE,
-            f"{BASE_URL}{MEMORY_DOCUMENT_DETAIL_ENDPOINT.format(memory_name=memory_name, document_name=document_name)}",
-            json=mock_responses["memory_docs_delete"],
-            status=200,
-        )
-
-        result = langbase_client.memories.documents.delete(memory_name, document_name)
+        result = langbase_client.memories.documents.delete(MEMORY_NAME, DOCUMENT_NAME)
 
         assert result == mock_responses["memory_docs_delete"]
-        assert len(responses.calls) == 1
-        request = responses.calls[0].request
+        assert len(mock_http.calls) == 1
+        request = mock_http.calls[0]
         validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
 
-    @responses.activate
-    def test_documents_upload_simple(
-        self, langbase_client, mock_responses, upload_file_content
+    @pytest.mark.parametrize(
+        "meta", [None, {"author": "test", "category": "documentation"}]
+    )
+    def test_documents_upload(
+        self, langbase_client, mock_http, upload_file_content, meta
     ):
-        """Test documents.upload method."""
-        memory_name = "test-memory"
-        document_name = "test-doc.txt"
-
-        # Mock the signed URL request
-        responses.add(
-            responses.POST,
-            f"{BASE_URL}{MEMORY_DOCUMENTS_UPLOAD_ENDPOINT}",
-            json=mock_responses["memory_docs_upload_signed_url"],
-            status=200,
-        )
-
-        # Mock the file upload to signed URL
-        responses.add(
-            responses.PUT,
-            "https://storage.langbase.com/upload?signature=xyz",
-            status=200,
-        )
-
-        result = langbase_client.memories.documents.upload(
-            memory_name=memory_name,
-            document_name=document_name,
+        """Test documents.upload method with and without metadata."""
+        langbase_client.memories.documents.upload(
+            memory_name=MEMORY_NAME,
+            document_name=DOCUMENT_NAME,
             document=upload_file_content,
             content_type="text/plain",
+            meta=meta,
         )
 
-        assert len(responses.calls) == 2
-        request = responses.calls[0].request
-        validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
-        assert responses.calls[1].request.body == upload_file_content
+        assert len(mock_http.calls) == 2
+        signed_url_request, upload_request = mock_http.calls
         validate_response_headers(
-            responses.calls[1].request.headers,
-            {**AUTHORIZATION_HEADER, "Content-Type": "text/plain"},
-        )
-
-    @responses.activate
-    def test_documents_upload_with_metadata(
-        self, langbase_client, mock_responses, upload_file_content
-    ):
-        """Test documents.upload method with metadata."""
-        memory_name = "test-memory"
-        document_name = "test-doc.txt"
-        metadata = {"author": "test", "category": "documentation"}
-
-        # Mock the signed URL request
-        responses.add(
-            responses.POST,
-            f"{BASE_URL}{MEMORY_DOCUMENTS_UPLOAD_ENDPOINT}",
-            json=mock_responses["memory_docs_upload_signed_url"],
-            status=200,
-        )
-
-        # Mock the file upload to signed URL
-        responses.add(
-            responses.PUT,
-            "https://storage.langbase.com/upload?signature=xyz",
-            status=200,
+            signed_url_request.headers, AUTH_AND_JSON_CONTENT_HEADER
         )
-
-        result = langbase_client.memories.documents.upload(
-            memory_name=memory_name,
-            document_name=document_name,
+        assert body_json(signed_url_request) == {
+            "memoryName": MEMORY_NAME,
+            "fileName": DOCUMENT_NAME,
+            "meta": meta or {},
+        }
+        assert upload_request.body == upload_file_content
+        validate_response_headers(upload_request.headers, TEXT_UPLOAD_HEADERS)
+
+    def test_documents_upload_uses_client_session(self, mock_http, upload_file_content):
+        """Test documents.upload sends the file upload through the client session."""
+        session = requests.Session()
+        session.headers["X-Session"] = "shared"
+        client = Langbase(api_key="test-api-key", session=session)
+
+        client.memories.documents.upload(
+            memory_name=MEMORY_NAME,
+            document_name=DOCUMENT_NAME,
             document=upload_file_content,
             content_type="text/plain",
-            meta=metadata,
         )
 
-        signed_url_request = responses.calls[0].request
-        validate_response_headers(
-            signed_url_request.headers, AUTH_AND_JSON_CONTENT_HEADER
-        )
-        request_json = json.loads(signed_url_request.body)
-        assert request_json["meta"] == metadata
+        assert len(mock_http.calls) == 2
+        _, upload_request = mock_http.calls
+        assert upload_request.url == SIGNED_UPLOAD_URL
+        assert upload_request.headers["X-Session"] == "shared"
 
-    @responses.activate
-    def test_documents_embeddings_retry(self, langbase_client, mock_responses):
+    def test_documents_embeddings_retry(
+        self, langbase_client, mock_http, mock_responses
+    ):
         """Test documents.embeddings.retry method."""
-        memory_name = "test-memory"
-        document_name = "test-doc.txt"
-
-        responses.add(
-            responses.GET,
-            f"{BASE_URL}{MEMORY_DOCUMENT_EMBEDDINGS_RETRY_ENDPOINT.format(memory_name=memory_name, document_name=document_name)}",
-            json=mock_responses["memory_docs_embeddings_retry"],
-            status=200,
-        )
-
         result = langbase_client.memories.documents.embeddings.retry(
-            memory_name, document_name
+            MEMORY_NAME, DOCUMENT_NAME
         )
 
         assert result == mock_responses["memory_docs_embeddings_retry"]
-        assert len(responses.calls) == 1
-        request = responses.calls[0].request
+        assert len(mock_http.calls) == 1
+        request = mock_http.calls[0]
         validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
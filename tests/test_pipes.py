@@ -3,42 +3,73 @@ Tests for the Pipes API.
 """
 
 import json
+from collections.abc import Iterator
+from types import MappingProxyType
+from typing import List
 
 import pytest
-import responses
 
 from langbase import Langbase
-from langbase.constants import BASE_URL, PIPES_ENDPOINT
-from tests.constants import (
-    AUTH_AND_JSON_CONTENT_HEADER,
-    AUTHORIZATION_HEADER,
-    JSON_CONTENT_TYPE_HEADER,
+from langbase.constants import (
+    BASE_URL,
+    PIPE_DETAIL_ENDPOINT,
+    PIPE_RUN_ENDPOINT,
+    PIPES_ENDPOINT,
 )
-from tests.validation_utils import validate_response_headers
+from langbase.types import PipeListResponse
+from tests.constants import AUTH_AND_JSON_CONTENT_HEADER
+from tests.validation_utils import (
+    body_json,
+    validate_response_body,
+    validate_response_headers,
+)
+
+pytestmark = pytest.mark.xdist_group(name="pipes")
+
+PIPE_NAME = "test-pipe"
+# Read-only by the SDK, so one list is shared by every run test.
+MESSAGES = [{"role": "user", "content": "Hello"}]
+RUN_BODY = {"name": PIPE_NAME, "messages": MESSAGES}
+ALL_PARAMETERS_RUN_BODY = {
+    **RUN_BODY,
+    "temperature": 0.7,
+    "max_tokens": 100,
+    "top_p": 0.9,
+    "stream": False,
+    "variables": {"var1": "value1"},
+    "thread_id": "existing_thread",
+}
+PIPES_URL = f"{BASE_URL}{PIPES_ENDPOINT}"
+PIPE_DETAIL_URL = f"{BASE_URL}{PIPE_DETAIL_ENDPOINT.format(name=PIPE_NAME)}"
+PIPE_RUN_URL = f"{BASE_URL}{PIPE_RUN_ENDPOINT}"
+PIPE_KEY_HEADERS = MappingProxyType(
+    {**AUTH_AND_JSON_CONTENT_HEADER, "Authorization": "Bearer pipe-specific-key"}
+)
+LLM_KEY_HEADERS = MappingProxyType(
+    {**AUTH_AND_JSON_CONTENT_HEADER, "LB-LLM-KEY": "custom-llm-key"}
+)
+
+MOCK_ROUTES = [
+    ("GET", PIPES_URL, "pipe_list", 200),
+    ("POST", PIPES_URL, "pipe_create", 201),
+    ("POST", PIPE_RUN_URL, "pipe_run", 200),
+]
 
 
 class TestPipes:
     """Test the Pipes API."""
 
-    @responses.activate
-    def test_pipes_list(self, langbase_client, mock_responses):
+    def test_pipes_list(self, langbase_client, mock_http, mock_responses):
         """Test pipes.list method."""
-        responses.add(
-            responses.GET,
-            f"{BASE_URL}{PIPES_ENDPOINT}",
-            json=mock_responses["pipe_list"],
-            status=200,
-        )
-
         result = langbase_client.pipes.list()
 
         assert result == mock_responses["pipe_list"]
-        request = responses.calls[0].request
-        assert len(responses.calls) == 1
+        validate_response_body(result, List[PipeListResponse])
+        request = mock_http.calls[0]
+        assert len(mock_http.calls) == 1
         validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
 
-    @responses.activate
-    def test_pipes_create(self, langbase_client, mock_responses):
+    def test_pipes_create(self, langbase_client, mock_http, mock_responses):
         """Test pipes.create method."""
         request_body = {
             "name": "new-pipe",
@@ -46,218 +77,113 @@ class TestPipes:
             "model": "anthropic:claude-3-sonnet",
         }
 
-        responses.add(
-            responses.POST,
-            f"{BASE_URL}{PIPES_ENDPOINT}",
-            json=mock_responses["pipe_create"],
-            status=201,
-        )
-
         result = langbase_client.pipes.create(**request_body)
-        request = responses.calls[0].request
+        request = mock_http.calls[0]
         assert result == mock_responses["pipe_create"]
-        assert len(responses.calls) == 1
-        assert json.loads(request.body) == request_body
+        assert len(mock_http.calls) == 1
+        assert body_json(request) == request_body
         validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
 
-    @responses.activate
-    def test_pipes_update(self, langbase_client, mock_responses):
+    def test_pipes_update(self, langbase_client, mock_http, mock_responses):
         """Test pipes.update method."""
-        pipe_name = "test-pipe"
         request_body = {"temperature": 0.7, "description": "Updated description"}
 
-        responses.add(
-            responses.POST,
-            f"{BASE_URL}{PIPES_ENDPOINT}/{pipe_name}",
-            json={**mock_responses["pipe_create"], **request_body},
-            status=200,
+        mock_http.add(
+            "POST",
+            PIPE_DETAIL_URL,
+            body=json.dumps({**mock_responses["pipe_create"], **request_body}).encode(),
         )
 
-        result = langbase_client.pipes.update(name=pipe_name, **request_body)
-        request = responses.calls[0].request
+        result = langbase_client.pipes.update(name=PIPE_NAME, **request_body)
+        request = mock_http.calls[0]
 
         assert result == {**mock_responses["pipe_create"], **request_body}
-        assert len(responses.calls) == 1
-        assert json.loads(request.body) == {
-            "name": pipe_name,
+        assert len(mock_http.calls) == 1
+        assert body_json(request) == {
+            "name": PIPE_NAME,
             **request_body,
         }
         validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
 
-    @responses.activate
-    def test_pipes_run_basic(self, langbase_client, mock_responses):
-        """Test pipes.run method with basic parameters."""
-        messages = [{"role": "user", "content": "Hello"}]
-
-        responses.add(
-            responses.POST,
-            f"{BASE_URL}{PIPES_ENDPOINT}/run",
-            json=mock_responses["pipe_run"],
-            status=200,
-        )
-
-        request_body = {
-            "name": "test-pipe",
-            "messages": messages,
-        }
-
-        result = langbase_client.pipes.run(**request_body)
-        request = responses.calls[0].request
-
-        assert result == mock_responses["pipe_run"]
-        assert len(responses.calls) == 1
-
-        # Validate body.
-        assert json.loads(request.body) == request_body
-
-        # Validate headers.
-        validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
-
-    @responses.activate
-    def test_pipes_run_with_api_key(self, langbase_client, mock_responses):
-        """Test pipes.run method with pipe API key."""
-        messages = [{"role": "user", "content": "Hello"}]
-
-        request_body = {"messages": messages}
-
-        responses.add(
-            responses.POST,
-            f"{BASE_URL}{PIPES_ENDPOINT}/run",
-            json=mock_responses["pipe_run"],
-            status=200,
-        )
-
-        result = langbase_client.pipes.run(api_key="pipe-specific-key", **request_body)
-        request = responses.calls[0].request
-
-        assert result == mock_responses["pipe_run"]
-        assert len(responses.calls) == 1
-
-        assert json.loads(request.body) == {
-            **request_body,
-            "api_key": "pipe-specific-key",
-        }
-        validate_response_headers(
-            request.headers,
-            {
-                **AUTH_AND_JSON_CONTENT_HEADER,
-                "Authorization": "Bearer pipe-specific-key",
-            },
-        )
-
-    @responses.activate
-    def test_pipes_run_streaming(self, langbase_client, stream_chunks):
-        """Test pipes.run method with streaming."""
-        messages = [{"role": "user", "content": "Hello"}]
-
-        request_body = {"name": "test-pipe", "messages": messages, "stream": True}
-
-        # Create streaming response
-        stream_content = b"".join(stream_chunks)
-
-        responses.add(
-            responses.POST,
-            f"{BASE_URL}{PIPES_ENDPOINT}/run",
-            body=stream_content,
-            status=200,
-            headers={
-                "Content-Type": "text/event-stream",
-            },
-        )
-
-        result = langbase_client.pipes.run(**request_body)
-        request = responses.calls[0].request
-
-        assert hasattr(result["stream"], "__iter__")
-        assert len(responses.calls) == 1
-
-        # Validate body
-        assert json.loads(request.body) == request_body
-        validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
-
-    @responses.activate
-    def test_pipes_run_with_llm_key(self, langbase_client, mock_responses):
-        """Test pipes.run method with LLM key header."""
-        messages = [{"role": "user", "content": "Hello"}]
-
-        request_body = {"name": "test-pipe", "messages": messages}
-
-        responses.add(
-            responses.POST,
-            f"{BASE_URL}{PIPES_ENDPOINT}/run",
-            json=mock_responses["pipe_run"],
-            status=200,
-        )
-
-        result = langbase_client.pipes.run(llm_key="custom-llm-key", **request_body)
-        request = responses.calls[0].request
+    @pytest.mark.parametrize(
+        "run_kwargs, expected_body, expected_headers",
+        [
+            pytest.param(RUN_BODY, RUN_BODY, AUTH_AND_JSON_CONTENT_HEADER, id="basic"),
+            pytest.param(
+                {"messages": MESSAGES, "api_key": "pipe-specific-key"},
+                {"messages": MESSAGES, "api_key": "pipe-specific-key"},
+                PIPE_KEY_HEADERS,
+                id="api_key",
+            ),
+            pytest.param(
+                {**RUN_BODY, "llm_key": "custom-llm-key"},
+                RUN_BODY,
+                LLM_KEY_HEADERS,
+                id="llm_key",
+            ),
+            pytest.param(
+                ALL_PARAMETERS_RUN_BODY,
+                ALL_PARAMETERS_RUN_BODY,
+                AUTH_AND_JSON_CONTENT_HEADER,
+                id="all_parameters",
+            ),
+        ],
+    )
+    def test_pipes_run(
+        self,
+        langbase_client,
+        mock_http,
+        mock_responses,
+        run_kwargs,
+        expected_body,
+        expected_headers,
+    ):
+        """Test pipes.run method with basic parameters, keys and all parameters."""
+        result = langbase_client.pipes.run(**run_kwargs)
+        request = mock_http.calls[0]
 
         assert result == mock_responses["pipe_run"]
-        assert len(responses.calls) == 1
-
-        # Validate body
-        assert json.loads(request.body) == request_body
+        assert len(mock_http.calls) == 1
+        assert body_json(request) == expected_body
+        validate_response_headers(request.headers, expected_headers)
 
-        validate_response_headers(
-            request.headers,
-            {**AUTH_AND_JSON_CONTENT_HEADER, "LB-LLM-KEY": "custom-llm-key"},
-        )
-
-    @responses.activate
-    def test_pipes_run_with_all_parameters(self, langbase_client, mock_responses):
-        """Test pipes.run method with all possible parameters."""
-        request_body = {
-            "name": "test-pipe",
-            "messages": [{"role": "user", "content": "Hello"}],
-            "temperature": 0.7,
-            "max_tokens": 100,
-            "top_p": 0.9,
-            "stream": False,
-            "variables": {"var1": "value1"},
-            "thread_id": "existing_thread",
-        }
-
-        responses.add(
-            responses.POST,
-            f"{BASE_URL}{PIPES_ENDPOINT}/run",
-            json=mock_responses["pipe_run"],
-            status=200,
-        )
-
-        result = langbase_client.pipes.run(**request_body)
-        request = responses.calls[0].request
+    def test_pipes_list_with_overridden_api_key(
+        self, langbase_client, mock_http, override_api_key, api_key
+    ):
+        """Test that a temporary client API key is sent and then restored."""
+        with override_api_key(langbase_client, "override-key") as client:
+            client.pipes.list()
 
-        assert result == mock_responses["pipe_run"]
-        assert len(responses.calls) == 1
+        langbase_client.pipes.list()
 
-        # Verify all parameters were included in request
-        assert json.loads(request.body) == request_body
-        validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
+        assert len(mock_http.calls) == 2
+        assert mock_http.calls[0].headers["Authorization"] == "Bearer override-key"
+        assert mock_http.calls[1].headers["Authorization"] == f"Bearer {api_key}"
+        assert langbase_client.api_key == api_key
 
-    @responses.activate
-    def test_pipes_run_stream_parameter_not_included_when_false(
-        self, langbase_client, mock_responses
+    @pytest.mark.parametrize("stream", [True, False])
+    def test_pipes_run_stream_parameter(
+        self, langbase_client, mock_http, mock_responses, stream_body, stream
     ):
-        """Test that stream parameter is included in request when explicitly set to False."""
-        request_body = {
-            "name": "test-pipe",
-            "messages": [{"role": "user", "content": "Hello"}],
-            "stream": False,
-        }
-
-        responses.add(
-            responses.POST,
-            f"{BASE_URL}{PIPES_ENDPOINT}/run",
-            json=mock_responses["pipe_run"],
-            status=200,
-        )
+        """Test that an explicit stream flag is always included in the request."""
+        request_body = {**RUN_BODY, "stream": stream}
+        if stream:
+            mock_http.add(
+                "POST",
+                PIPE_RUN_URL,
+                body=stream_body,
+                content_type="text/event-stream",
+            )
 
         result = langbase_client.pipes.run(**request_body)
-        request = responses.calls[0].request
+        request = mock_http.calls[0]
 
-        assert result == mock_responses["pipe_run"]
-        assert len(responses.calls) == 1
+        if stream:
+            assert isinstance(result["stream"], Iterator)
+        else:
+            assert result == mock_responses["pipe_run"]
+        assert len(mock_http.calls) == 1
 
-        # Validate body - stream should be included when explicitly set to False
-        assert json.loads(request.body) == request_body
+        # Validate body - stream should be included whether it is True or False
+        assert body_json(request) == request_body
         validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
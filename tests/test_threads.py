@@ -2,10 +2,9 @@
 Tests for the Threads API.
 """
 
-import json
+from typing import List
 
 import pytest
-import responses
 
 from langbase.constants import (
     BASE_URL,
@@ -13,219 +12,140 @@ from langbase.constants import (
     THREAD_MESSAGES_ENDPOINT,
     THREADS_ENDPOINT,
 )
-from langbase.errors import APIError
-from tests.constants import (
-    AUTH_AND_JSON_CONTENT_HEADER,
-    AUTHORIZATION_HEADER,
-    JSON_CONTENT_TYPE_HEADER,
+from langbase.types import ThreadMessagesBaseResponse
+from tests.constants import AUTH_AND_JSON_CONTENT_HEADER
+from tests.validation_utils import (
+    body_json,
+    validate_response_body,
+    validate_response_headers,
 )
-from tests.validation_utils import validate_response_headers
 
+pytestmark = pytest.mark.xdist_group(name="threads")
 
-class TestThreads:
-    """Test the Threads API."""
-
-    @responses.activate
-    def test_threads_create_basic(self, langbase_client, mock_responses):
-        """Test threads.create method with basic parameters."""
-        responses.add(
-            responses.POST,
-            f"{BASE_URL}{THREADS_ENDPOINT}",
-            json=mock_responses["threads_create"],
-            status=200,
-        )
-
-        result = langbase_client.threads.create({})
-
-        assert result == mock_responses["threads_create"]
-        assert len(responses.calls) == 1
-        request = responses.calls[0].request
-        validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
-
-    @responses.activate
-    def test_threads_create_with_metadata(self, langbase_client, mock_responses):
-        """Test threads.create method with metadata."""
-        request_body = {"metadata": {"user_id": "123", "session": "abc"}}
-
-        responses.add(
-            responses.POST,
-            f"{BASE_URL}{THREADS_ENDPOINT}",
-            json=mock_responses["threads_create_with_metadata"],
-            status=200,
-        )
-
-        result = langbase_client.threads.create(metadata=request_body["metadata"])
-
-        assert result == mock_responses["threads_create_with_metadata"]
-        assert len(responses.calls) == 1
-        request = responses.calls[0].request
-        validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
-        assert json.loads(request.body) == request_body
-
-    @responses.activate
-    def test_threads_create_with_thread_id(self, langbase_client, mock_responses):
-        """Test threads.create method with specific thread ID."""
-        thread_id = "custom_thread_456"
+THREAD_ID = "thread_123"
+THREADS_URL = f"{BASE_URL}{THREADS_ENDPOINT}"
+THREAD_DETAIL_URL = f"{BASE_URL}{THREAD_DETAIL_ENDPOINT.format(thread_id=THREAD_ID)}"
+THREAD_MESSAGES_URL = (
+    f"{BASE_URL}{THREAD_MESSAGES_ENDPOINT.format(thread_id=THREAD_ID)}"
+)
+METADATA = {"user_id": "123", "session": "abc"}
+INITIAL_MESSAGES = [
+    {"role": "user", "content": "Hello"},
+    {"role": "assistant", "content": "Hi there!"},
+]
 
-        responses.add(
-            responses.POST,
-            f"{BASE_URL}{THREADS_ENDPOINT}",
-            json=mock_responses["threads_create_with_thread_id"],
-            status=200,
-        )
+MOCK_ROUTES = [
+    ("POST", THREAD_DETAIL_URL, "threads_update", 200),
+    ("GET", THREAD_DETAIL_URL, "threads_get", 200),
+    ("DELETE", THREAD_DETAIL_URL, "threads_delete", 200),
+    ("GET", THREAD_MESSAGES_URL, "threads_messages_list", 200),
+    ("POST", THREAD_MESSAGES_URL, "threads_append", 200),
+]
 
-        result = langbase_client.threads.create(thread_id=thread_id)
 
-        assert result == mock_responses["threads_create_with_thread_id"]
+class TestThreads:
+    """Test the Threads API."""
 
-        # Verify thread_id was included
-        request = responses.calls[0].request
-        validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
-        print("request.body", request.body)
-        assert json.loads(request.body) == {"threadId": thread_id}
-
-    @responses.activate
-    def test_threads_create_with_messages(self, langbase_client, mock_responses):
-        """Test threads.create method with initial messages."""
-        request_body = {
-            "messages": [
-                {"role": "user", "content": "Hello"},
-                {"role": "assistant", "content": "Hi there!"},
-            ]
-        }
-
-        responses.add(
-            responses.POST,
-            f"{BASE_URL}{THREADS_ENDPOINT}",
-            json=mock_responses["threads_create_with_messages"],
-            status=200,
-        )
-
-        result = langbase_client.threads.create(messages=request_body["messages"])
-
-        assert result == mock_responses["threads_create_with_messages"]
-        assert len(responses.calls) == 1
-        request = responses.calls[0].request
+    @pytest.mark.parametrize(
+        "create_kwargs, response_key, expected_body",
+        [
+            pytest.param({}, "threads_create", None, id="basic"),
+            pytest.param(
+                {"metadata": METADATA},
+                "threads_create_with_metadata",
+                {"metadata": METADATA},
+                id="metadata",
+            ),
+            pytest.param(
+                {"thread_id": "custom_thread_456"},
+                "threads_create_with_thread_id",
+                {"threadId": "custom_thread_456"},
+                id="thread_id",
+            ),
+            pytest.param(
+                {"messages": INITIAL_MESSAGES},
+                "threads_create_with_messages",
+                {"messages": INITIAL_MESSAGES},
+                id="messages",
+            ),
+        ],
+    )
+    def test_threads_create(
+        self,
+        langbase_client,
+        mock_http,
+        mock_responses,
+        mock_response_bodies,
+        create_kwargs,
+        response_key,
+        expected_body,
+    ):
+        """Test threads.create method with each optional parameter."""
+        mock_http.add("POST", THREADS_URL, body=mock_response_bodies[response_key])
+
+        result = langbase_client.threads.create(**create_kwargs)
+
+        assert result == mock_responses[response_key]
+        assert len(mock_http.calls) == 1
+        request = mock_http.calls[0]
         validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
-        assert json.loads(request.body) == request_body
+        if expected_body is None:
+            assert request.body is None
+        else:
+            assert body_json(request) == expected_body
 
-    @responses.activate
-    def test_threads_update(self, langbase_client, mock_responses):
+    def test_threads_update(self, langbase_client, mock_http, mock_responses):
         """Test threads.update method."""
-        request_data = {
-            "thread_id": "thread_123",
-            "metadata": {"user_id": "123", "session": "abc"},
-        }
-
-        responses.add(
-            responses.POST,
-            f"{BASE_URL}{THREAD_DETAIL_ENDPOINT.format(thread_id=request_data['thread_id'])}",
-            json=mock_responses["threads_update"],
-            status=200,
-        )
-
-        result = langbase_client.threads.update(**request_data)
+        result = langbase_client.threads.update(thread_id=THREAD_ID, metadata=METADATA)
 
         assert result == mock_responses["threads_update"]
-        assert len(responses.calls) == 1
-        request = responses.calls[0].request
+        assert len(mock_http.calls) == 1
+        request = mock_http.calls[0]
         validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
-        assert (
-            request.url
-            == f"{BASE_URL}{THREAD_DETAIL_ENDPOINT.format(thread_id=request_data['thread_id'])}"
-        )
-        assert json.loads(request.body) == {"metadata": request_data["metadata"]}
-
-    @responses.activate
-    def test_threads_get(self, langbase_client, mock_responses):
-        """Test threads.get method."""
-        thread_id = "thread_123"
-
-        responses.add(
-            responses.GET,
-            f"{BASE_URL}{THREAD_DETAIL_ENDPOINT.format(thread_id=thread_id)}",
-            json=mock_responses["threads_get"],
-            status=200,
-        )
+        assert request.url == THREAD_DETAIL_URL
+        assert body_json(request) == {"metadata": METADATA}
 
-        result = langbase_client.threads.get(thread_id)
+    def test_threads_get(self, langbase_client, mock_http, mock_responses):
+        """Test threads.get method."""
+        result = langbase_client.threads.get(THREAD_ID)
 
         assert result == mock_responses["threads_get"]
-        assert len(responses.calls) == 1
-        request = responses.calls[0].request
+        assert len(mock_http.calls) == 1
+        request = mock_http.calls[0]
         validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
-        assert (
-            request.url
-            == f"{BASE_URL}{THREAD_DETAIL_ENDPOINT.format(thread_id=thread_id)}"
-        )
+        assert request.url == THREAD_DETAIL_URL
 
-    @responses.activate
-    def test_threads_delete(self, langbase_client, mock_responses):
+    def test_threads_delete(self, langbase_client, mock_http, mock_responses):
         """Test threads.delete method."""
-        thread_id = "thread_123"
-
-        responses.add(
-            responses.DELETE,
-            f"{BASE_URL}{THREAD_DETAIL_ENDPOINT.format(thread_id=thread_id)}",
-            json=mock_responses["threads_delete"],
-            status=200,
-        )
-
-        result = langbase_client.threads.delete(thread_id)
+        result = langbase_client.threads.delete(THREAD_ID)
 
         assert result == mock_responses["threads_delete"]
-        assert len(responses.calls) == 1
-        request = responses.calls[0].request
+        assert len(mock_http.calls) == 1
+        request = mock_http.calls[0]
         validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
-        assert (
-            request.url
-            == f"{BASE_URL}{THREAD_DETAIL_ENDPOINT.format(thread_id=thread_id)}"
-        )
+        assert request.url == THREAD_DETAIL_URL
 
-    @responses.activate
-    def test_threads_messages_list(self, langbase_client, mock_responses):
+    def test_threads_messages_list(self, langbase_client, mock_http, mock_responses):
         """Test threads.messages.list method."""
-        thread_id = "thread_123"
-
-        responses.add(
-            responses.GET,
-            f"{BASE_URL}{THREAD_MESSAGES_ENDPOINT.format(thread_id=thread_id)}",
-            json=mock_responses["threads_messages_list"],
-            status=200,
-        )
-
-        result = langbase_client.threads.messages.list(thread_id)
+        result = langbase_client.threads.messages.list(THREAD_ID)
 
         assert result == mock_responses["threads_messages_list"]
-        assert len(responses.calls) == 1
-        request = responses.calls[0].request
+        validate_response_body(result, List[ThreadMessagesBaseResponse])
+        assert len(mock_http.calls) == 1
+        request = mock_http.calls[0]
         validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
-        assert (
-            request.url
-            == f"{BASE_URL}{THREAD_MESSAGES_ENDPOINT.format(thread_id=thread_id)}"
-        )
+        assert request.url == THREAD_MESSAGES_URL
 
-    @responses.activate
-    def test_threads_append(self, langbase_client, mock_responses):
+    def test_threads_append(self, langbase_client, mock_http, mock_responses):
         """Test threads.append method."""
-        thread_id = "thread_123"
-        request_body = {"messages": [{"role": "user", "content": "New message"}]}
-
-        responses.add(
-            responses.POST,
-            f"{BASE_URL}{THREAD_MESSAGES_ENDPOINT.format(thread_id=thread_id)}",
-            json=mock_responses["threads_append"],
-            status=200,
-        )
+        messages = [{"role": "user", "content": "New message"}]
 
-        result = langbase_client.threads.append(thread_id, request_body["messages"])
+        result = langbase_client.threads.append(THREAD_ID, messages)
 
         assert result == mock_responses["threads_append"]
-        assert len(responses.calls) == 1
-        request = responses.calls[0].request
+        validate_response_body(result, List[ThreadMessagesBaseResponse])
+        assert len(mock_http.calls) == 1
+        request = mock_http.calls[0]
         validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
-        assert json.loads(request.body) == request_body["messages"]
-        assert (
-            request.url
-            == f"{BASE_URL}{THREAD_MESSAGES_ENDPOINT.format(thread_id=thread_id)}"
-        )
+        assert body_json(request) == messages
+        assert request.url == THREAD_MESSAGES_URL
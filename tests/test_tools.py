@@ -2,93 +2,80 @@
 Tests for the Tools.
 """
 
-import json
+from types import MappingProxyType
+from typing import List
 
-import responses
+import pytest
 
 from langbase.constants import BASE_URL, TOOLS_CRAWL_ENDPOINT, TOOLS_WEB_SEARCH_ENDPOINT
+from langbase.types import ToolCrawlResponse, ToolWebSearchResponse
 from tests.constants import AUTH_AND_JSON_CONTENT_HEADER
-from tests.validation_utils import validate_response_headers
+from tests.validation_utils import (
+    body_json,
+    validate_response_body,
+    validate_response_headers,
+)
+
+pytestmark = pytest.mark.xdist_group(name="tools")
+
+WEB_SEARCH_URL = f"{BASE_URL}{TOOLS_WEB_SEARCH_ENDPOINT}"
+CRAWL_URL = f"{BASE_URL}{TOOLS_CRAWL_ENDPOINT}"
+WEB_SEARCH_API_KEY = "search_api_key"
+CRAWL_API_KEY = "crawl_api_key"
+WEB_SEARCH_HEADERS = MappingProxyType(
+    {**AUTH_AND_JSON_CONTENT_HEADER, "LB-WEB-SEARCH-KEY": WEB_SEARCH_API_KEY}
+)
+CRAWL_HEADERS = MappingProxyType(
+    {**AUTH_AND_JSON_CONTENT_HEADER, "LB-CRAWL-KEY": CRAWL_API_KEY}
+)
+CRAWL_URLS = ["https://example.com", "https://test.com", "https://demo.org"]
+
+MOCK_ROUTES = [
+    ("POST", WEB_SEARCH_URL, "tools_web_search", 200),
+    ("POST", CRAWL_URL, "tools_crawl", 200),
+]
 
 
 class TestTools:
     """Test the Tools API."""
 
-    @responses.activate
-    def test_tools_web_search_basic(self, langbase_client, mock_responses):
+    def test_tools_web_search_basic(self, langbase_client, mock_http, mock_responses):
         """Test tools.web_search method with basic parameters."""
-        responses.add(
-            responses.POST,
-            f"{BASE_URL}{TOOLS_WEB_SEARCH_ENDPOINT}",
-            json=mock_responses["tools_web_search"],
-            status=200,
+        result = langbase_client.tools.web_search(
+            query="test search", api_key=WEB_SEARCH_API_KEY
         )
 
-        request_body = {"query": "test search", "api_key": "search_api_key"}
-
-        result = langbase_client.tools.web_search(**request_body)
-
         assert result == mock_responses["tools_web_search"]
-        assert len(responses.calls) == 1
-        request = responses.calls[0].request
-        validate_response_headers(
-            request.headers,
-            {
-                **AUTH_AND_JSON_CONTENT_HEADER,
-                "LB-WEB-SEARCH-KEY": request_body["api_key"],
-            },
-        )
-        assert json.loads(request.body) == {"query": "test search", "service": "exa"}
-
-    @responses.activate
-    def test_tools_crawl_basic(self, langbase_client, mock_responses):
-        """Test tools.crawl method with basic parameters."""
-        request_body = {"url": ["https://example.com"], "api_key": "crawl_api_key"}
-
-        responses.add(
-            responses.POST,
-            f"{BASE_URL}{TOOLS_CRAWL_ENDPOINT}",
-            json=mock_responses["tools_crawl"],
-            status=200,
-        )
-
-        result = langbase_client.tools.crawl(**request_body)
+        validate_response_body(result, List[ToolWebSearchResponse])
+        assert len(mock_http.calls) == 1
+        request = mock_http.calls[0]
+        validate_response_headers(request.headers, WEB_SEARCH_HEADERS)
+        assert body_json(request) == {"query": "test search", "service": "exa"}
+
+    @pytest.mark.parametrize(
+        "crawl_kwargs, expected_body",
+        [
+            pytest.param(
+                {"url": ["https://example.com"]},
+                {"url": ["https://example.com"]},
+                id="basic",
+            ),
+            pytest.param(
+                {"url": CRAWL_URLS, "max_pages": 1},
+                {"url": CRAWL_URLS, "maxPages": 1},
+                id="multiple_urls",
+            ),
+        ],
+    )
+    def test_tools_crawl(
+        self, langbase_client, mock_http, mock_responses, crawl_kwargs, expected_body
+    ):
+        """Test tools.crawl method with one or more URLs."""
+        result = langbase_client.tools.crawl(api_key=CRAWL_API_KEY, **crawl_kwargs)
 
         assert result == mock_responses["tools_crawl"]
-        assert len(responses.calls) == 1
-        request = responses.calls[0].request
-        validate_response_headers(
-            request.headers,
-            {**AUTH_AND_JSON_CONTENT_HEADER, "LB-CRAWL-KEY": request_body["api_key"]},
-        )
-        assert json.loads(request.body) == {"url": ["https://example.com"]}
-
-    @responses.activate
-    def test_tools_crawl_multiple_urls(self, langbase_client, mock_responses):
-        """Test tools.crawl method with multiple URLs."""
-        request_body = {
-            "url": ["https://example.com", "https://test.com", "https://demo.org"],
-            "api_key": "crawl_api_key",
-            "max_pages": 1,
-        }
-
-        responses.add(
-            responses.POST,
-            f"{BASE_URL}{TOOLS_CRAWL_ENDPOINT}",
-            json=mock_responses["tools_crawl"],
-            status=200,
-        )
-
-        result = langbase_client.tools.crawl(**request_body)
-
-        assert result == mock_responses["tools_crawl"]
-        assert len(responses.calls) == 1
-        request = responses.calls[0].request
-        validate_response_headers(
-            request.headers,
-            {**AUTH_AND_JSON_CONTENT_HEADER, "LB-CRAWL-KEY": request_body["api_key"]},
-        )
-        assert json.loads(request.body) == {
-            "url": request_body["url"],
-            "maxPages": request_body["max_pages"],
-        }
+        validate_response_body(result, List[ToolCrawlResponse])
+        assert len(mock_http.calls) == 1
+        request = mock_http.calls[0]
+        validate_response_headers(request.headers, CRAWL_HEADERS)
+        assert body_json(request) == expected_body
@@ -2,9 +2,9 @@
 Tests for utility methods.
 """
 
-import json
+from collections.abc import Iterator
 
-import responses
+import pytest
 
 from langbase.constants import (
     AGENT_RUN_ENDPOINT,
@@ -13,51 +13,56 @@ from langbase.constants import (
     EMBED_ENDPOINT,
     PARSER_ENDPOINT,
 )
-from langbase.types import (
-    AgentRunResponse,
-    ChunkResponse,
-    EmbedResponse,
-    ParseResponse,
-    RunResponseStream,
+from langbase.types import ChunkResponse, EmbedResponse, ParseResponse
+from tests.constants import AUTH_AND_JSON_CONTENT_HEADER, AUTHORIZATION_HEADER
+from tests.validation_utils import (
+    body_json,
+    validate_response_body,
+    validate_response_headers,
 )
-from tests.constants import (
-    AUTH_AND_JSON_CONTENT_HEADER,
-    AUTHORIZATION_HEADER,
-    JSON_CONTENT_TYPE_HEADER,
-)
-from tests.validation_utils import validate_response_headers
+
+pytestmark = pytest.mark.xdist_group(name="utilities")
+
+EMBED_URL = f"{BASE_URL}{EMBED_ENDPOINT}"
+CHUNKER_URL = f"{BASE_URL}{CHUNKER_ENDPOINT}"
+PARSER_URL = f"{BASE_URL}{PARSER_ENDPOINT}"
+AGENT_RUN_URL = f"{BASE_URL}{AGENT_RUN_ENDPOINT}"
+AGENT_MESSAGES = [
+    {"role": "user", "content": "Hello"},
+    {"role": "assistant", "content": "Hi there!"},
+]
+AGENT_TOOLS = [{"type": "function", "function": {"name": "test"}}]
+
+MOCK_ROUTES = [
+    ("POST", EMBED_URL, "embed", 200),
+    ("POST", CHUNKER_URL, "chunker", 200),
+    ("POST", PARSER_URL, "parser", 200),
+    ("POST", AGENT_RUN_URL, "agent.run", 200),
+]
 
 
 class TestUtilities:
     """Test utility methods."""
 
-    @responses.activate
-    def test_embed_with_model(self, langbase_client, mock_responses):
+    def test_embed_with_model(self, langbase_client, mock_http, mock_responses):
         """Test embed method with specific model."""
         request_body = {
             "chunks": ["First chunk", "Second chunk"],
             "embeddingModel": "openai:text-embedding-ada-002",
         }
 
-        responses.add(
-            responses.POST,
-            f"{BASE_URL}{EMBED_ENDPOINT}",
-            json=mock_responses["embed"],
-            status=200,
-        )
-
         result = langbase_client.embed(
             request_body["chunks"], embedding_model="openai:text-embedding-ada-002"
         )
 
         assert result == mock_responses["embed"]
-        assert len(responses.calls) == 1
-        request = responses.calls[0].request
+        validate_response_body(result, EmbedResponse)
+        assert len(mock_http.calls) == 1
+        request = mock_http.calls[0]
         validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
-        assert json.loads(request.body) == request_body
+        assert body_json(request) == request_body
 
-    @responses.activate
-    def test_chunker_with_parameters(self, langbase_client, mock_responses):
+    def test_chunker_with_parameters(self, langbase_client, mock_http, mock_responses):
         """Test chunker method with custom parameters."""
         request_body = {
             "content": "Long document content for chunking test.",
@@ -65,13 +70,6 @@ class TestUtilities:
             "chunkOverlap": 50,
         }
 
-        responses.add(
-            responses.POST,
-            f"{BASE_URL}{CHUNKER_ENDPOINT}",
-            json=mock_responses["chunker"],
-            status=200,
-        )
-
         result = langbase_client.chunker(
             content=request_body["content"],
             chunk_max_length=request_body["chunkMaxLength"],
@@ -79,148 +77,116 @@ class TestUtilities:
         )
 
         assert result == mock_responses["chunker"]
-        assert len(responses.calls) == 1
-        request = responses.calls[0].request
+        validate_response_body(result, ChunkResponse)
+        assert len(mock_http.calls) == 1
+        request = mock_http.calls[0]
         validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
-        assert json.loads(request.body) == request_body
+        assert body_json(request) == request_body
 
-    @responses.activate
-    def test_parser_with_different_content_types(
-        self, langbase_client, mock_responses, upload_file_content
-    ):
-        """Test parser method with different content types."""
-        test_cases = [
+    @pytest.mark.parametrize(
+        "document_name, content_type",
+        [
             ("document.pdf", "application/pdf"),
             (
                 "document.docx",
                 "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
             ),
             ("document.txt", "text/plain"),
-        ]
-
-        for i, (document_name, content_type) in enumerate(test_cases):
-            responses.add(
-                responses.POST,
-                f"{BASE_URL}{PARSER_ENDPOINT}",
-                json=mock_responses["parser"],
-                status=200,
-            )
-
-            result = langbase_client.parser(
-                document=upload_file_content,
-                document_name=document_name,
-                content_type=content_type,
-            )
-
-            assert result == {
-                "document_name": mock_responses["parser"]["documentName"],
-                "content": mock_responses["parser"]["content"],
-            }
-            # The number of calls increases with each iteration
-            assert len(responses.calls) == i + 1
-            request = responses.calls[i].request
-            validate_response_headers(request.headers, AUTHORIZATION_HEADER)
-
-    @responses.activate
-    def test_agent_run_basic(self, langbase_client, mock_responses):
-        """Test agent.run method with basic parameters."""
-        request_body = {
-            "input": "Hello, agent!",
-            "model": "anthropic:claude-3-sonnet",
-            "apiKey": "test-llm-key",
-        }
-
-        responses.add(
-            responses.POST,
-            f"{BASE_URL}{AGENT_RUN_ENDPOINT}",
-            json=mock_responses["agent.run"],
-            status=200,
-        )
-
-        result = langbase_client.agent.run(
-            input=request_body["input"],
-            model=request_body["model"],
-            api_key=request_body["apiKey"],
-        )
-
-        assert result == mock_responses["agent.run"]
-        assert len(responses.calls) == 1
-        request = responses.calls[0].request
-        validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
-        assert json.loads(request.body) == request_body
-
-    @responses.activate
-    def test_agent_run_with_messages(self, langbase_client, mock_responses):
-        """Test agent.run method with message format input."""
-        request_body = {
-            "input": [
-                {"role": "user", "content": "Hello"},
-                {"role": "assistant", "content": "Hi there!"},
-            ],
-            "model": "openai:gpt-4",
-            "apiKey": "openai-key",
-        }
-
-        responses.add(
-            responses.POST,
-            f"{BASE_URL}{AGENT_RUN_ENDPOINT}",
-            json=mock_responses["agent.run"],
-            status=200,
-        )
-
-        result = langbase_client.agent.run(
-            input=request_body["input"],
-            model=request_body["model"],
-            api_key=request_body["apiKey"],
+        ],
+    )
+    def test_parser_with_different_content_types(
+        self,
+        langbase_client,
+        mock_http,
+        mock_responses,
+        upload_file_content,
+        document_name,
+        content_type,
+    ):
+        """Test parser method with different content types."""
+        result = langbase_client.parser(
+            document=upload_file_content,
+            document_name=document_name,
+            content_type=content_type,
         )
 
-        assert result == mock_responses["agent.run"]
-        assert len(responses.calls) == 1
-        request = responses.calls[0].request
-        validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
-        assert json.loads(request.body) == request_body
-
-    @responses.activate
-    def test_agent_run_with_all_parameters(self, langbase_client, mock_responses):
-        """Test agent.run method with all parameters."""
-        request_body = {
-            "input": "Complex query",
-            "model": "anthropic:claude-3-sonnet",
-            "apiKey": "test-key",
-            "instructions": "Be helpful and concise",
-            "temperature": 0.7,
-            "max_tokens": 150,
-            "top_p": 0.9,
-            "tools": [{"type": "function", "function": {"name": "test"}}],
+        assert result == {
+            "document_name": mock_responses["parser"]["documentName"],
+            "content": mock_responses["parser"]["content"],
         }
-
-        responses.add(
-            responses.POST,
-            f"{BASE_URL}{AGENT_RUN_ENDPOINT}",
-            json=mock_responses["agent.run"],
-            status=200,
-        )
-
-        result = langbase_client.agent.run(
-            input=request_body["input"],
-            model=request_body["model"],
-            api_key=request_body["apiKey"],
-            instructions=request_body["instructions"],
-            temperature=request_body["temperature"],
-            max_tokens=request_body["max_tokens"],
-            top_p=request_body["top_p"],
-            tools=request_body["tools"],
-            stream=False,
-        )
+        validate_response_body(result, ParseResponse)
+        assert len(mock_http.calls) == 1
+        request = mock_http.calls[0]
+        validate_response_headers(request.headers, AUTHORIZATION_HEADER)
+
+    @pytest.mark.parametrize(
+        "run_kwargs, expected_body",
+        [
+            pytest.param(
+                {
+                    "input": "Hello, agent!",
+                    "model": "anthropic:claude-3-sonnet",
+                    "api_key": "test-llm-key",
+                },
+                {
+                    "input": "Hello, agent!",
+                    "model": "anthropic:claude-3-sonnet",
+                    "apiKey": "test-llm-key",
+                },
+                id="basic",
+            ),
+            pytest.param(
+                {
+                    "input": AGENT_MESSAGES,
+                    "model": "openai:gpt-4",
+                    "api_key": "openai-key",
+                },
+                {
+                    "input": AGENT_MESSAGES,
+                    "model": "openai:gpt-4",
+                    "apiKey": "openai-key",
+                },
+                id="messages",
+            ),
+            pytest.param(
+                {
+                    "input": "Complex query",
+                    "model": "anthropic:claude-3-sonnet",
+                    "api_key": "test-key",
+                    "instructions": "Be helpful and concise",
+                    "temperature": 0.7,
+                    "max_tokens": 150,
+                    "top_p": 0.9,
+                    "tools": AGENT_TOOLS,
+                    "stream": False,
+                },
+                {
+                    "input": "Complex query",
+                    "model": "anthropic:claude-3-sonnet",
+                    "apiKey": "test-key",
+                    "instructions": "Be helpful and concise",
+                    "temperature": 0.7,
+                    "max_tokens": 150,
+                    "top_p": 0.9,
+                    "tools": AGENT_TOOLS,
+                },
+                id="all_parameters",
+            ),
+        ],
+    )
+    def test_agent_run(
+        self, langbase_client, mock_http, mock_responses, run_kwargs, expected_body
+    ):
+        """Test agent.run method with string input, messages and all parameters."""
+        result = langbase_client.agent.run(**run_kwargs)
 
         assert result == mock_responses["agent.run"]
-        assert len(responses.calls) == 1
-        request = responses.calls[0].request
+        assert len(mock_http.calls) == 1
+        request = mock_http.calls[0]
         validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
-        assert json.loads(request.body) == request_body
+        assert body_json(request) == expected_body
 
-    @responses.activate
-    def test_agent_run_streaming(self, langbase_client, stream_chunks):
+    def test_agent_run_streaming(self, langbase_client, mock_http, stream_body):
         """Test agent.run method with streaming."""
         request_body = {
             "input": "Streaming query",
@@ -228,14 +194,8 @@ class TestUtilities:
             "apiKey": "stream-key",
             "stream": True,
         }
-        stream_content = b"".join(stream_chunks)
-
-        responses.add(
-            responses.POST,
-            f"{BASE_URL}{AGENT_RUN_ENDPOINT}",
-            body=stream_content,
-            status=200,
-            headers={"Content-Type": "text/event-stream"},
+        mock_http.add(
+            "POST", AGENT_RUN_URL, body=stream_body, content_type="text/event-stream"
         )
 
         result = langbase_client.agent.run(
@@ -246,8 +206,8 @@ class TestUtilities:
         )
 
         assert "stream" in result
-        assert hasattr(result["stream"], "__iter__")
-        assert len(responses.calls) == 1
-        request = responses.calls[0].request
+        assert isinstance(result["stream"], Iterator)
+        assert len(mock_http.calls) == 1
+        request = mock_http.calls[0]
         validate_response_headers(request.headers, AUTH_AND_JSON_CONTENT_HEADER)
-        assert json.loads(request.body) == request_body
+        assert body_json(request) == request_body
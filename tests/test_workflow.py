@@ -3,7 +3,6 @@ Tests for the Workflow execution engine.
 """
 
 import asyncio
-import time
 
 import pytest
 
@@ -16,6 +15,35 @@ from langbase.workflow import (
     WorkflowContext,
 )
 
+pytestmark = pytest.mark.xdist_group(name="workflow")
+
+
+@pytest.fixture
+def recorded_sleeps(monkeypatch):
+    """Replace the retry sleep with a no-op that records each requested delay."""
+    sleeps = []
+
+    async def _record_sleep(self, seconds):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(Workflow, "_sleep", _record_sleep)
+    return sleeps
+
+
+def assert_in_order(output, markers):
+    """Assert every marker appears in output, in order, in a single scan."""
+    position = 0
+    for marker in markers:
+        found = output.find(marker, position)
+        assert found != -1, f"{marker!r} not found in order in:\n{output}"
+        position = found + len(marker)
+
+
+@pytest.fixture(scope="module")
+def shared_workflow():
+    """A workflow for tests that only call its pure helpers."""
+    return Workflow()
+
 
 class TestWorkflow:
     """Test the Workflow execution engine."""
@@ -32,7 +60,7 @@ class TestWorkflow:
         assert debug_workflow._debug is True
         assert debug_workflow.context == {"outputs": {}}
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_basic_step_execution(self):
         """Test basic step execution without retries or timeout."""
         workflow = Workflow()
@@ -47,13 +75,13 @@ class TestWorkflow:
         assert result == "success"
         assert workflow.context["outputs"]["test_step"] == "success"
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_step_with_timeout_success(self):
         """Test step execution with timeout that completes in time."""
         workflow = Workflow()
 
         async def quick_task():
-            await asyncio.sleep(0.01)  # 10ms
+            await asyncio.sleep(0)
             return "completed"
 
         config: StepConfig = {
@@ -67,18 +95,19 @@ class TestWorkflow:
         assert result == "completed"
         assert workflow.context["outputs"]["quick_step"] == "completed"
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_step_with_timeout_failure(self):
         """Test step execution that times out."""
         workflow = Workflow()
 
         async def slow_task():
-            await asyncio.sleep(0.2)  # 200ms
+            # Cancelled by the timeout, so the long sleep costs no wall-clock time
+            await asyncio.sleep(1)
             return "should_not_complete"
 
         config: StepConfig = {
             "id": "slow_step",
-            "timeout": 50,  # 50ms timeout
+            "timeout": 10,  # 10ms timeout
             "run": slow_task,
         }
 
@@ -86,12 +115,12 @@ class TestWorkflow:
             await workflow.step(config)
 
         assert exc_info.value.step_id == "slow_step"
-        assert exc_info.value.timeout == 50
+        assert exc_info.value.timeout == 10
         assert "slow_step" in str(exc_info.value)
-        assert "50ms" in str(exc_info.value)
+        assert "10ms" in str(exc_info.value)
 
-    @pytest.mark.asyncio
-    async def test_step_with_retries_success_on_retry(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_step_with_retries_success_on_retry(self, recorded_sleeps):
         """Test step that fails initially but succeeds on retry."""
         workflow = Workflow()
 
@@ -115,10 +144,11 @@ class TestWorkflow:
 
         assert result == "success_on_retry"
         assert call_count == 3
+        assert recorded_sleeps == [0.01, 0.01]
         assert workflow.context["outputs"]["flaky_step"] == "success_on_retry"
 
-    @pytest.mark.asyncio
-    async def test_step_with_retries_failure_after_all_attempts(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_step_with_retries_failure_after_all_attempts(self, recorded_sleeps):
         """Test step that fails after all retry attempts."""
         workflow = Workflow()
 
@@ -136,38 +166,37 @@ class TestWorkflow:
             await workflow.step(config)
 
         assert "Persistent failure" in str(exc_info.value)
-
-    def test_exponential_backoff_calculation(self):
-        """Test exponential backoff delay calculation."""
-        workflow = Workflow()
-
-        # Test exponential backoff: base_delay * (2 ** (attempt - 1))
-        assert workflow._calculate_delay(100, 1, "exponential") == 100  # 100 * 2^0
-        assert workflow._calculate_delay(100, 2, "exponential") == 200  # 100 * 2^1
-        assert workflow._calculate_delay(100, 3, "exponential") == 400  # 100 * 2^2
-        assert workflow._calculate_delay(100, 4, "exponential") == 800  # 100 * 2^3
-
-    def test_linear_backoff_calculation(self):
-        """Test linear backoff delay calculation."""
-        workflow = Workflow()
-
-        # Test linear backoff: base_delay * attempt
-        assert workflow._calculate_delay(100, 1, "linear") == 100  # 100 * 1
-        assert workflow._calculate_delay(100, 2, "linear") == 200  # 100 * 2
-        assert workflow._calculate_delay(100, 3, "linear") == 300  # 100 * 3
-        assert workflow._calculate_delay(50, 4, "linear") == 200  # 50 * 4
-
-    def test_fixed_backoff_calculation(self):
-        """Test fixed backoff delay calculation."""
-        workflow = Workflow()
-
-        # Test fixed backoff: always base_delay
-        assert workflow._calculate_delay(100, 1, "fixed") == 100
-        assert workflow._calculate_delay(100, 2, "fixed") == 100
-        assert workflow._calculate_delay(100, 3, "fixed") == 100
-        assert workflow._calculate_delay(100, 10, "fixed") == 100
-
-    @pytest.mark.asyncio
+        assert recorded_sleeps == [0.01, 0.01]
+
+    @pytest.mark.parametrize(
+        "strategy, base_delay, attempt, expected",
+        [
+            # Exponential backoff: base_delay * (2 ** (attempt - 1))
+            ("exponential", 100, 1, 100),
+            ("exponential", 100, 2, 200),
+            ("exponential", 100, 3, 400),
+            ("exponential", 100, 4, 800),
+            # Linear backoff: base_delay * attempt
+            ("linear", 100, 1, 100),
+            ("linear", 100, 2, 200),
+            ("linear", 100, 3, 300),
+            ("linear", 50, 4, 200),
+            # Fixed backoff: always base_delay
+            ("fixed", 100, 1, 100),
+            ("fixed", 100, 2, 100),
+            ("fixed", 100, 3, 100),
+            ("fixed", 100, 10, 100),
+        ],
+    )
+    def test_backoff_calculation(
+        self, shared_workflow, strategy, base_delay, attempt, expected
+    ):
+        """Test retry delay calculation for each backoff strategy."""
+        delay = shared_workflow._calculate_delay(base_delay, attempt, strategy)
+
+        assert delay == expected
+
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_multiple_steps_context_accumulation(self):
         """Test that multiple steps accumulate results in context."""
         workflow = Workflow()
@@ -197,13 +226,13 @@ class TestWorkflow:
         assert context["outputs"]["step3"] == {"data": "result3"}
         assert len(context["outputs"]) == 3
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_debug_mode_output(self, capsys):
         """Test debug mode logging output using pytest's capsys fixture."""
         workflow = Workflow(debug=True)
 
         async def test_task():
-            await asyncio.sleep(0.01)
+            await asyncio.sleep(0)
             return "debug_result"
 
         config: StepConfig = {"id": "debug_step", "timeout": 1000, "run": test_task}
@@ -215,14 +244,19 @@ class TestWorkflow:
         output = captured.out
 
         assert result == "debug_result"
-        assert "🔄 Starting step: debug_step" in output
-        assert "⏳ Timeout: 1000ms" in output
-        assert "⏱️ Step debug_step:" in output
-        assert "📤 Output: debug_result" in output
-        assert "✅ Completed step: debug_step" in output
-
-    @pytest.mark.asyncio
-    async def test_debug_mode_retry_output(self, capsys):
+        assert_in_order(
+            output,
+            (
+                "🔄 Starting step: debug_step",
+                "⏳ Timeout: 1000ms",
+                "⏱️ Step debug_step:",
+                "📤 Output: debug_result",
+                "✅ Completed step: debug_step",
+            ),
+        )
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_debug_mode_retry_output(self, capsys, recorded_sleeps):
         """Test debug mode output during retries using pytest's capsys fixture."""
         workflow = Workflow(debug=True)
 
@@ -249,11 +283,17 @@ class TestWorkflow:
         output = captured.out
 
         assert result == "retry_success"
-        assert "🔄 Retries:" in output
-        assert "⚠️ Attempt 1 failed, retrying in 10ms..." in output
-        assert "Error: Unknown Error (Debug retry test)" in output
-
-    @pytest.mark.asyncio
+        assert_in_order(
+            output,
+            (
+                "🔄 Retries:",
+                "⚠️ Attempt 1 failed, retrying in 10ms...",
+                "Error: Unknown Error (Debug retry test)",
+            ),
+        )
+        assert recorded_sleeps == [0.01]
+
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_step_with_complex_return_type(self):
         """Test step with complex return types (dict, list, etc.)."""
         workflow = Workflow()
@@ -278,7 +318,7 @@ class TestWorkflow:
         assert result == expected
         assert workflow.context["outputs"]["complex_step"] == expected
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_step_error_without_retries(self):
         """Test step that fails without retry configuration."""
         workflow = Workflow()
@@ -294,31 +334,37 @@ class TestWorkflow:
 
         assert "Test error without retries" in str(exc_info.value)
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_concurrent_step_execution(self):
         """Test that workflow steps can be executed concurrently."""
         workflow1 = Workflow()
         workflow2 = Workflow()
 
+        arrived = []
+        both_started = asyncio.Event()
+
+        async def rendezvous(result):
+            arrived.append(result)
+            if len(arrived) == 2:
+                both_started.set()
+            await both_started.wait()
+            return result
+
         async def task1():
-            await asyncio.sleep(0.02)
-            return "task1_result"
+            return await rendezvous("task1_result")
 
         async def task2():
-            await asyncio.sleep(0.02)
-            return "task2_result"
+            return await rendezvous("task2_result")
 
         config1: StepConfig = {"id": "concurrent1", "run": task1}
         config2: StepConfig = {"id": "concurrent2", "run": task2}
 
-        # Execute concurrently
-        start_time = time.time()
-        results = await asyncio.gather(workflow1.step(config1), workflow2.step(config2))
-        end_time = time.time()
-
-        # Should complete in roughly the time of one task (not two)
-        execution_time = end_time - start_time
-        assert execution_time < 0.05  # Less than 50ms for both tasks
+        # Each task waits for the other to start, so running them one after
+        # the other would hang until the timeout instead of completing.
+        results = await asyncio.wait_for(
+            asyncio.gather(workflow1.step(config1), workflow2.step(config2)),
+            timeout=1,
+        )
 
         assert results == ["task1_result", "task2_result"]
         assert workflow1.context["outputs"]["concurrent1"] == "task1_result"
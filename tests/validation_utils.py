@@ -1,31 +1,73 @@
+import functools
+import json
 import types
-from typing import Any, Dict, Literal, Type, Union, get_args, get_origin
+import weakref
+from typing import Any, Dict, Literal, Tuple, Type, Union, get_args, get_origin
+
+# Plain types checked with a single isinstance, before any typing introspection.
+_PRIMITIVE_TYPES = frozenset({bool, bytes, float, int, str})
+
+# Decoded request bodies, dropped as soon as the request itself is collected.
+_DECODED_BODIES: "weakref.WeakKeyDictionary[Any, Any]" = weakref.WeakKeyDictionary()
+
+
+def body_json(request: Any) -> Any:
+    """Returns the decoded JSON body of a captured request, parsing it only once."""
+    try:
+        return _DECODED_BODIES[request]
+    except KeyError:
+        decoded = _DECODED_BODIES[request] = json.loads(request.body)
+        return decoded
 
 
 def validate_response_headers(
     headers: Dict[str, Any], expected_headers: Dict[str, Any]
 ):
     """Validates that the response headers contain the expected headers."""
-    for key, value in expected_headers.items():
-        assert key in headers
-        assert headers[key] == value
+    assert (
+        expected_headers.items() <= headers.items()
+    ), f"Expected headers {dict(expected_headers)} not all found in {dict(headers)}"
+
+
+@functools.lru_cache(maxsize=None)
+def _type_shape(response_type: Type) -> Tuple[Any, Tuple]:
+    """Returns (origin, args) of a type, computed once per type."""
+    return get_origin(response_type), get_args(response_type)
+
+
+@functools.lru_cache(maxsize=None)
+def _field_schema(response_type: Type) -> Tuple[Tuple[str, Any, Any, Tuple], ...]:
+    """Returns (key, type, origin, args) for each field, computed once per type."""
+    return tuple(
+        (key, value_type, get_origin(value_type), get_args(value_type))
+        for key, value_type in response_type.__annotations__.items()
+    )
 
 
 def validate_response_body(body: Dict[str, Any], response_type: Type):
     """Validates that the response body conforms to the given type."""
+    if response_type is Any:
+        return
+    if response_type in _PRIMITIVE_TYPES:
+        assert isinstance(body, response_type)
+        return
+
+    origin, args = _type_shape(response_type)
+
+    # List[T] validates every item against T in a single call.
+    if origin is list and args:
+        assert isinstance(body, list)
+        (item_type,) = args
+        for item in body:
+            validate_response_body(item, item_type)
+        return
+
     if not hasattr(response_type, "__annotations__"):
-        origin = get_origin(response_type)
-        if origin:
-            assert isinstance(body, origin)
-        elif response_type is not Any:
-            assert isinstance(body, response_type)
+        assert isinstance(body, origin or response_type)
         return
 
-    for key, value_type in response_type.__annotations__.items():
+    for key, value_type, origin, args in _field_schema(response_type):
         if key in body and body[key] is not None:
-            origin = get_origin(value_type)
-            args = get_args(value_type)
-
             if origin is Literal:
                 assert (
                     body[key] in args